@@ -4,7 +4,34 @@ import argparse
 from src.orchestrator import Orchestrator
 
 
+_SEP = "-" * 40
+
+_HELP_TEXT = (
+    "\nHelp:\n"
+    + "-" * 30 + "\n"
+    "Enter expressions like:\n"
+    "  5+3      - Addition\n"
+    "  10-4     - Subtraction\n"
+    "  6*7      - Multiplication\n"
+    "  15/3     - Division\n"
+    "  2^10     - Power\n"
+    "  5!        - Factorial\n"
+    + "-" * 30 + "\n"
+    "Big number examples:\n"
+    "  999+999       = 1998\n"
+    "  1000*500      = 500000\n"
+    "  999^2         = 998001\n"
+    "  123456789*10  = 1234567890\n"
+    + "-" * 30 + "\n"
+)
+
+
 def main():
+    # Big number mode allows results of up to 1000000 bits (about 301000
+    # digits), past the 4300-digit str() limit of Python 3.11+
+    if hasattr(sys, 'set_int_max_str_digits'):
+        sys.set_int_max_str_digits(0)
+    
     parser = argparse.ArgumentParser(
         description='Brainfuck Calculator',
         epilog='Example: python main.py "999+999" "1000*500"'
@@ -39,7 +66,7 @@ def main():
     
     if args.expressions:
         print("\nResults:")
-        print("-" * 40)
+        print(_SEP)
         
         for expr in args.expressions:
             try:
@@ -53,7 +80,7 @@ def main():
             except Exception as e:
                 print(f"{expr}: ERROR - {e}")
         
-        print("-" * 40)
+        print(_SEP)
     
     if args.interactive or (not args.expressions):
         run_interactive_mode(orchestrator, args.force_8bit)
@@ -110,22 +137,7 @@ def run_interactive_mode(orchestrator, force_8bit=False):
 
 def print_help():
     """Print help information"""
-    print("\nHelp:")
-    print("-" * 30)
-    print("Enter expressions like:")
-    print("  5+3      - Addition")
-    print("  10-4     - Subtraction")
-    print("  6*7      - Multiplication")
-    print("  15/3     - Division")
-    print("  2^10     - Power")
-    print("  5!        - Factorial")
-    print("-" * 30)
-    print("Big number examples:")
-    print("  999+999       = 1998")
-    print("  1000*500      = 500000")
-    print("  999^2         = 998001")
-    print("  123456789*10  = 1234567890")
-    print("-" * 30)
+    sys.stdout.write(_HELP_TEXT)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,147 @@
 # Is welcome to use!
 
+# numpy and numba are optional and only imported by the first execute_jit call
+np = None
+_jit_kernel = None
+
+# Opcodes of the compiled operation list
+OP_ADD = 0      # (OP_ADD, n): add n to the current cell
+OP_MOVE = 1     # (OP_MOVE, n): move the pointer n cells right
+OP_CLEAR = 2    # (OP_CLEAR,): set the current cell to zero
+OP_MULADD = 3   # (OP_MULADD, offset, factor): add current cell * factor at offset
+OP_PRINT = 4    # (OP_PRINT,): output the current cell
+OP_READ = 5     # (OP_READ,): read one input byte into the current cell
+OP_JZ = 6       # (OP_JZ, target): jump past matching JNZ if cell is zero
+OP_JNZ = 7      # (OP_JNZ, target): jump back to matching JZ if cell is non-zero
+
+BF_COMMANDS = '><+-.,[]'
+
+# Deletes every ASCII character that is not a Brainfuck command
+_NON_COMMANDS = str.maketrans('', '', ''.join(chr(i) for i in range(128) if chr(i) not in BF_COMMANDS))
+
+
+def sanitize_code(code):
+    """
+    Strip everything except Brainfuck commands from code
+    
+    Args:
+        code (str): Raw Brainfuck source, comments included
+        
+    Returns:
+        str: Only the '><+-.,[]' characters of code
+    """
+    return code.encode('ascii', 'ignore').decode('ascii').translate(_NON_COMMANDS)
+
+
+def _run_lowered(opcodes, args, factors, tape, pointer, inp, tape_size, cell_size):
+    """
+    Run lowered ops on a uint8 tape, meant to be compiled with numba
+    
+    Args:
+        opcodes (ndarray): int8 opcode per op
+        args (ndarray): int32 first argument per op (amount, offset or jump target)
+        factors (ndarray): int32 MULADD factor per op
+        tape (ndarray): uint8 tape, modified in place
+        pointer (int): Initial tape pointer
+        inp (ndarray): uint8 input bytes
+        tape_size (int): Number of memory cells
+        cell_size (int): Maximum value per cell
+        
+    Returns:
+        tuple: Output bytes array, final pointer and number of input bytes read
+    """
+    out = np.empty(16, np.uint8)
+    out_len = 0
+    inp_index = 0
+    pc = 0
+    end = opcodes.shape[0]
+    
+    while pc < end:
+        opcode = opcodes[pc]
+        
+        if opcode == OP_ADD:
+            tape[pointer] = (tape[pointer] + args[pc]) % cell_size
+        elif opcode == OP_MOVE:
+            pointer = (pointer + args[pc]) % tape_size
+        elif opcode == OP_JZ:
+            if tape[pointer] == 0:
+                pc = args[pc]
+        elif opcode == OP_JNZ:
+            if tape[pointer] != 0:
+                pc = args[pc]
+        elif opcode == OP_MULADD:
+            target = (pointer + args[pc]) % tape_size
+            tape[target] = (tape[target] + tape[pointer] * factors[pc]) % cell_size
+        elif opcode == OP_CLEAR:
+            tape[pointer] = 0
+        elif opcode == OP_PRINT:
+            if out_len == out.shape[0]:
+                grown = np.empty(out_len * 2, np.uint8)
+                grown[:out_len] = out
+                out = grown
+            out[out_len] = tape[pointer]
+            out_len += 1
+        elif opcode == OP_READ:
+            if inp_index < inp.shape[0]:
+                tape[pointer] = inp[inp_index]
+                inp_index += 1
+            else:
+                tape[pointer] = 0
+        
+        pc += 1
+    
+    return out[:out_len], pointer, inp_index
+
+
+def _load_jit_kernel():
+    """
+    Import numba and wrap _run_lowered with njit, once per process
+    
+    Returns:
+        function: Compiled kernel, or None if numba is not installed
+    """
+    global np, _jit_kernel
+    
+    if _jit_kernel is None:
+        try:
+            import numpy
+            from numba import njit
+        except ImportError:
+            # Without numba, execute_jit falls back to execute
+            _jit_kernel = False
+        else:
+            np = numpy
+            _jit_kernel = njit(cache=True)(_run_lowered)
+    
+    return _jit_kernel or None
+
+
+class BrainfuckProgram:
+    """Brainfuck code compiled once by BrainfuckInterpreter.compile"""
+    
+    def __init__(self, code, ops, jump_table, translated, lowered=None):
+        """
+        Args:
+            code (str): Sanitized Brainfuck code
+            ops (list): Compiled operations
+            jump_table (dict): Matching JZ/JNZ op indices
+            translated (function): Native Python version of ops, or None
+            lowered (tuple, optional): NumPy arrays of ops, filled in by the
+                first execute_jit run
+        """
+        self.code = code
+        self.ops = ops
+        self.jump_table = jump_table
+        self.translated = translated
+        self.lowered = lowered
+
+
 class BrainfuckInterpreter:
     """Interprets and executes Brainfuck code"""
     
+    # Python functions translated from compiled ops, shared by all instances
+    _translated = {}
+    
     def __init__(self, tape_size=30000, cell_size=256):
         """
         Initialize interpreter with specified memory configuration
@@ -10,31 +149,267 @@ class BrainfuckInterpreter:
         Args:
             tape_size (int): Number of memory cells
             cell_size (int): Maximum value per cell (0 to cell_size-1)
+        
+        Cells that fit in a byte (cell_size <= 256) are stored in a bytearray,
+        and output is collected in one too; larger cells fall back to lists.
         """
         self.tape_size = tape_size
         self.cell_size = cell_size
+        self.jump_table = {}
         self.reset()
     
     def reset(self):
         """Reset interpreter state to initial conditions"""
-        self.tape = [0] * self.tape_size
+        if self.cell_size <= 256:
+            self.tape = bytearray(self.tape_size)
+            self.output_buffer = bytearray()
+        else:
+            self.tape = [0] * self.tape_size
+            self.output_buffer = []
         self.pointer = 0
         self.input_buffer = b""
         self.input_index = 0
-        self.output_buffer = []
         self.code_pointer = 0
-        self.loop_stack = []
     
-    def load_code(self, code):
+    def compile(self, code):
         """
-        Load and sanitize Brainfuck code
+        Sanitize and compile Brainfuck code without loading it
         
         Args:
             code (str): Brainfuck code string
+            
+        Returns:
+            BrainfuckProgram: Program that can be passed to run() many times
+        """
+        code = sanitize_code(code)
+        ops, jump_table = self._compile_ops(code)
+        translated = self._get_translated(code, ops)
+        return BrainfuckProgram(code, ops, jump_table, translated)
+    
+    def load_program(self, program):
         """
-        self.code = ''.join(c for c in code if c in '><+-.,[]')
+        Load a compiled program and reset the interpreter state
+        
+        Args:
+            program (BrainfuckProgram): Program returned by compile()
+        """
+        self.code = program.code
+        self.ops = program.ops
+        self.jump_table = program.jump_table
+        self.translated = program.translated
+        self.program = program
         self.reset()
     
+    def load_code(self, code):
+        """
+        Load and sanitize Brainfuck code, then compile it into operations
+        
+        Args:
+            code (str): Brainfuck code string
+        """
+        self.load_program(self.compile(code))
+    
+    def _compile_ops(self, code):
+        """
+        Compile sanitized Brainfuck code into a list of operations
+        
+        Runs of '+'/'-' and '>'/'<' are collapsed into single ADD and MOVE
+        ops, '[-]' becomes CLEAR and copy/multiply loops such as '[->+<]'
+        become MULADD ops followed by CLEAR.
+        
+        Args:
+            code (str): Sanitized Brainfuck code
+            
+        Returns:
+            tuple: List of op tuples and a dict matching JZ/JNZ op indices
+        """
+        ops = []
+        stack = []
+        # ',' may store a byte >= cell_size, which only '+'/'-' reduce
+        keep_zero = self.cell_size < 256
+        
+        for command in code:
+            if command == '+':
+                self._emit(ops, OP_ADD, 1, self.cell_size, keep_zero)
+            elif command == '-':
+                self._emit(ops, OP_ADD, -1, self.cell_size, keep_zero)
+            elif command == '>':
+                self._emit(ops, OP_MOVE, 1, self.tape_size)
+            elif command == '<':
+                self._emit(ops, OP_MOVE, -1, self.tape_size)
+            elif command == '.':
+                ops.append((OP_PRINT,))
+            elif command == ',':
+                ops.append((OP_READ,))
+            elif command == '[':
+                stack.append(len(ops))
+                ops.append(None)
+            elif command == ']':
+                if not stack:
+                    raise RuntimeError("Unmatched ']' in Brainfuck code")
+                start = stack.pop()
+                folded = self._fold_loop(ops[start + 1:])
+                if folded is not None:
+                    del ops[start:]
+                    ops.extend(folded)
+                else:
+                    ops[start] = (OP_JZ, len(ops))
+                    ops.append((OP_JNZ, start))
+        
+        if stack:
+            raise RuntimeError("Unmatched '[' in Brainfuck code")
+        
+        jump_table = {}
+        for i, op in enumerate(ops):
+            if op[0] == OP_JZ or op[0] == OP_JNZ:
+                jump_table[i] = op[1]
+        
+        return ops, jump_table
+    
+    @staticmethod
+    def _emit(ops, opcode, amount, modulo, keep_zero=False):
+        """
+        Append an ADD or MOVE op, merging it into a preceding op of the same kind
+        
+        A net-zero op is dropped unless keep_zero is set, in which case it
+        is kept so the cell is still reduced modulo cell_size.
+        """
+        if ops and ops[-1] is not None and ops[-1][0] == opcode:
+            amount += ops.pop()[1]
+        
+        amount %= modulo
+        if amount or keep_zero:
+            ops.append((opcode, amount))
+    
+    def _fold_loop(self, body):
+        """
+        Try to replace a loop body with straight-line operations
+        
+        Args:
+            body (list): Ops between the loop brackets
+            
+        Returns:
+            list: Replacement ops, or None if the loop cannot be folded
+        """
+        offset = 0
+        deltas = {}
+        
+        for op in body:
+            if op[0] == OP_ADD:
+                deltas[offset] = deltas.get(offset, 0) + op[1]
+            elif op[0] == OP_MOVE:
+                offset = (offset + op[1]) % self.tape_size
+            else:
+                return None
+        
+        if offset != 0:
+            return None
+        
+        origin = deltas.pop(0, 0) % self.cell_size
+        
+        if not deltas and origin in (1, self.cell_size - 1):
+            return [(OP_CLEAR,)]
+        
+        # With cell_size < 256 an input byte can exceed cell_size, and the
+        # real loop then runs once instead of value times
+        if origin != self.cell_size - 1 or self.cell_size < 256:
+            return None
+        
+        folded = []
+        for target, factor in deltas.items():
+            factor %= self.cell_size
+            if factor:
+                folded.append((OP_MULADD, target, factor))
+        folded.append((OP_CLEAR,))
+        
+        return folded
+    
+    def _get_translated(self, code, ops):
+        """Return the translated function for the given code, translating it once"""
+        key = (code, self.tape_size, self.cell_size)
+        if key not in self._translated:
+            self._translated[key] = self._translate(ops)
+        return self._translated[key]
+    
+    def _translate(self, ops):
+        """
+        Translate compiled ops into a native Python function
+        
+        Loops become nested 'while' statements, so the generated function
+        runs without any per-op dispatch.
+        
+        Args:
+            ops (list): Compiled operations
+            
+        Returns:
+            function: run(tape, pointer, read, output) -> final pointer,
+                or None if Python cannot compile the generated source
+        """
+        tape_size = self.tape_size
+        cell_size = self.cell_size
+        lines = ["def run(tape, pointer, read, output):"]
+        indent = 1
+        
+        for op in ops:
+            pad = "    " * indent
+            opcode = op[0]
+            
+            if opcode == OP_ADD:
+                lines.append(f"{pad}tape[pointer] = (tape[pointer] + {op[1]}) % {cell_size}")
+            elif opcode == OP_MOVE:
+                lines.append(f"{pad}pointer = (pointer + {op[1]}) % {tape_size}")
+            elif opcode == OP_CLEAR:
+                lines.append(f"{pad}tape[pointer] = 0")
+            elif opcode == OP_MULADD:
+                lines.append(f"{pad}target = (pointer + {op[1]}) % {tape_size}")
+                lines.append(f"{pad}tape[target] = (tape[target] + tape[pointer] * {op[2]}) % {cell_size}")
+            elif opcode == OP_PRINT:
+                lines.append(f"{pad}output.append(tape[pointer])")
+            elif opcode == OP_READ:
+                lines.append(f"{pad}tape[pointer] = read()")
+            elif opcode == OP_JZ:
+                lines.append(f"{pad}while tape[pointer]:")
+                indent += 1
+            elif opcode == OP_JNZ:
+                if lines[-1].endswith(":"):
+                    lines.append(f"{pad}pass")
+                indent -= 1
+        
+        lines.append("    return pointer")
+        
+        namespace = {}
+        try:
+            exec(compile("\n".join(lines), "<bf>", "exec"), namespace)
+        except (SyntaxError, RecursionError, MemoryError):
+            # Too deeply nested for the Python compiler
+            return None
+        
+        return namespace["run"]
+    
+    @staticmethod
+    def _lower(ops):
+        """
+        Lower compiled ops into NumPy arrays for the numba kernel
+        
+        Args:
+            ops (list): Compiled operations
+            
+        Returns:
+            tuple: int8 opcodes, int32 arguments and int32 MULADD factors
+        """
+        opcodes = np.zeros(len(ops), dtype=np.int8)
+        args = np.zeros(len(ops), dtype=np.int32)
+        factors = np.zeros(len(ops), dtype=np.int32)
+        
+        for i, op in enumerate(ops):
+            opcodes[i] = op[0]
+            if len(op) > 1:
+                args[i] = op[1]
+            if len(op) > 2:
+                factors[i] = op[2]
+        
+        return opcodes, args, factors
+    
     def load_input(self, input_data):
         """
         Load input data for the ',' command
@@ -45,62 +420,53 @@ class BrainfuckInterpreter:
         self.input_buffer = input_data
         self.input_index = 0
     
+    def _read(self):
+        """Return the next input byte, or 0 once input is exhausted"""
+        if self.input_index < len(self.input_buffer):
+            value = self.input_buffer[self.input_index]
+            self.input_index += 1
+            return value
+        return 0
+    
     def step(self):
         """
-        Execute a single Brainfuck command
+        Execute a single compiled operation
         
         Returns:
             bool: True if execution should continue, False if finished
         """
-        if self.code_pointer >= len(self.code):
+        if self.code_pointer >= len(self.ops):
             return False
         
-        command = self.code[self.code_pointer]
+        op = self.ops[self.code_pointer]
+        opcode = op[0]
         
-        if command == '>':
-            self.pointer = (self.pointer + 1) % self.tape_size
+        if opcode == OP_ADD:
+            self.tape[self.pointer] = (self.tape[self.pointer] + op[1]) % self.cell_size
             
-        elif command == '<':
-            self.pointer = (self.pointer - 1) % self.tape_size
+        elif opcode == OP_MOVE:
+            self.pointer = (self.pointer + op[1]) % self.tape_size
             
-        elif command == '+':
-            self.tape[self.pointer] = (self.tape[self.pointer] + 1) % self.cell_size
+        elif opcode == OP_JZ:
+            if self.tape[self.pointer] == 0:
+                self.code_pointer = op[1]
+                
+        elif opcode == OP_JNZ:
+            if self.tape[self.pointer] != 0:
+                self.code_pointer = op[1]
+                
+        elif opcode == OP_MULADD:
+            target = (self.pointer + op[1]) % self.tape_size
+            self.tape[target] = (self.tape[target] + self.tape[self.pointer] * op[2]) % self.cell_size
             
-        elif command == '-':
-            self.tape[self.pointer] = (self.tape[self.pointer] - 1) % self.cell_size
+        elif opcode == OP_CLEAR:
+            self.tape[self.pointer] = 0
             
-        elif command == '.':
+        elif opcode == OP_PRINT:
             self.output_buffer.append(self.tape[self.pointer])
             
-        elif command == ',':
-            if self.input_index < len(self.input_buffer):
-                self.tape[self.pointer] = self.input_buffer[self.input_index]
-                self.input_index += 1
-            else:
-                self.tape[self.pointer] = 0
-            
-        elif command == '[':
-            if self.tape[self.pointer] == 0:
-                depth = 1
-                while depth > 0:
-                    self.code_pointer += 1
-                    if self.code_pointer >= len(self.code):
-                        raise RuntimeError("Unmatched '[' in Brainfuck code")
-                    if self.code[self.code_pointer] == '[':
-                        depth += 1
-                    elif self.code[self.code_pointer] == ']':
-                        depth -= 1
-            else:
-                self.loop_stack.append(self.code_pointer)
-                
-        elif command == ']':
-            if not self.loop_stack:
-                raise RuntimeError("Unmatched ']' in Brainfuck code")
-            
-            if self.tape[self.pointer] != 0:
-                self.code_pointer = self.loop_stack[-1]
-            else:
-                self.loop_stack.pop()
+        elif opcode == OP_READ:
+            self.tape[self.pointer] = self._read()
         
         self.code_pointer += 1
         return True
@@ -114,19 +480,83 @@ class BrainfuckInterpreter:
             input_data (bytes, optional): Input data for program
             
         Returns:
-            list: Output values from the program
+            bytearray: Output values from the program (a list for cells
+                larger than a byte)
+        """
+        if code is not None:
+            self.load_code(code)
+        
+        if input_data:
+            self.load_input(input_data)
+        
+        if self.translated is not None and self.code_pointer == 0:
+            self.pointer = self.translated(self.tape, self.pointer, self._read, self.output_buffer)
+            self.code_pointer = len(self.ops)
+        else:
+            while self.step():
+                pass
+        
+        return self.output_buffer
+    
+    def execute_jit(self, code=None, input_data=b""):
+        """
+        Execute Brainfuck code to completion with the numba kernel
+        
+        Falls back to execute() when numba is not installed, when cells
+        do not fit in a byte or when execution was started with step().
+        
+        Args:
+            code (str, optional): Brainfuck code to execute
+            input_data (bytes, optional): Input data for program
+            
+        Returns:
+            bytearray: Output values from the program
         """
         if code is not None:
             self.load_code(code)
         
+        kernel = _load_jit_kernel()
+        if kernel is None or self.cell_size > 256 or self.code_pointer != 0:
+            return self.execute(input_data=input_data)
+        
         if input_data:
             self.load_input(input_data)
         
-        while self.step():
-            pass
+        # Lower once per program, the arrays are reused by later runs
+        if self.program.lowered is None:
+            self.program.lowered = self._lower(self.ops)
+        
+        opcodes, args, factors = self.program.lowered
+        tape = np.frombuffer(self.tape, dtype=np.uint8)
+        inp = np.frombuffer(bytearray(self.input_buffer[self.input_index:]), dtype=np.uint8)
+        
+        out, self.pointer, read = kernel(
+            opcodes, args, factors, tape, self.pointer, inp, self.tape_size, self.cell_size
+        )
+        self.input_index += read
+        self.output_buffer.extend(out.tobytes())
+        self.code_pointer = len(self.ops)
         
         return self.output_buffer
     
+    def run(self, program, input_data=b"", jit=False):
+        """
+        Execute a compiled program from a fresh state
+        
+        Args:
+            program (BrainfuckProgram): Program returned by compile()
+            input_data (bytes, optional): Input data for program
+            jit (bool, optional): Use execute_jit instead of execute
+            
+        Returns:
+            bytearray: Output values from the program (a list for cells
+                larger than a byte)
+        """
+        self.load_program(program)
+        if jit:
+            return self.execute_jit(input_data=input_data)
+        return self.execute(input_data=input_data)
+    
     def execute_file(self, filename, input_data=b""):
         """
         Execute Brainfuck code from a file
@@ -136,7 +566,8 @@ class BrainfuckInterpreter:
             input_data (bytes, optional): Input data for program
             
         Returns:
-            list: Output values from the program
+            bytearray: Output values from the program (a list for cells
+                larger than a byte)
         """
         with open(filename, 'r', encoding='utf-8') as f:
             code = f.read()
@@ -154,7 +585,15 @@ class BrainfuckInterpreter:
         Returns:
             list: Tape values from start to end
         """
-        return self.tape[start:end]
+        return list(self.tape[start:end])
+    
+    def _loop_depth(self):
+        """Count the loops whose JZ has run and whose JNZ is still ahead"""
+        # JNZ entries point backwards, so only JZ entries can match
+        return sum(
+            1 for start, end in self.jump_table.items()
+            if start < self.code_pointer <= end
+        )
     
     def get_state(self):
         """
@@ -167,7 +606,7 @@ class BrainfuckInterpreter:
             'pointer': self.pointer,
             'current_cell': self.tape[self.pointer],
             'code_pointer': self.code_pointer,
-            'loop_depth': len(self.loop_stack),
+            'loop_depth': self._loop_depth(),
             'output_length': len(self.output_buffer),
             'input_remaining': len(self.input_buffer) - self.input_index
         }
\ No newline at end of file
@@ -1,57 +1,92 @@
-from math import inf
+import re
+import struct
+from functools import lru_cache
+from math import factorial, inf
 from pathlib import Path
-from .interpreter import BrainfuckInterpreter
+from .interpreter import BrainfuckInterpreter, sanitize_code
+
+
+# "<int><op><int>" or "<int>!", matched after whitespace is removed; operands
+# may use '_' digit separators like int() literals
+_EXPRESSION_RE = re.compile(r'([+-]?\d+(?:_\d+)*)(?:([\^*/+\-])([+-]?\d+(?:_\d+)*)|!)')
+
+# Packs the two 8-bit operands fed to a module's ',' commands
+_PACK_OPERANDS = struct.Struct('BB').pack
+
+
+@lru_cache(maxsize=None)
+def _load_bf_module(path):
+    # Read and sanitize each module file once per process
+    with open(path, 'r', encoding='utf-8') as f:
+        return sanitize_code(f.read())
 
 
 class Orchestrator:
-    def __init__(self, modules_dir="bf_modules", interpreter=None):
+    # Brainfuck module file for each 8-bit operation
+    _MODULE_FILES = {
+        '+': 'addition.bf',
+        '-': 'subtraction.bf',
+        '*': 'multiplication.bf',
+        '/': 'division.bf',
+        '^': 'power.bf',
+        '!': 'factorial.bf'
+    }
+    
+    # Compiled modules shared by all instances, keyed by code and memory layout
+    _compiled_modules = {}
+    
+    def __init__(self, modules_dir="bf_modules", interpreter=None, use_jit=False):
         self.modules_dir = Path(modules_dir)
         self.interpreter = interpreter or BrainfuckInterpreter()
+        # Run 8-bit modules with the numba kernel when numba is installed
+        self.use_jit = use_jit
         
-        # Load Brainfuck modules for 8-bit mode
-        self.operations = {
-            '+': self._load_module('addition.bf'),
-            '-': self._load_module('subtraction.bf'),
-            '*': self._load_module('multiplication.bf'),
-            '/': self._load_module('division.bf'),
-            '^': self._load_module('power.bf'),
-            '!': self._load_module('factorial.bf')
-        }
+        # Brainfuck modules are only needed in 8-bit mode, load them on first use
+        self._operations = None
+        self._compiled_ops = None
+    
+    @property
+    def operations(self):
+        if self._operations is None:
+            self._operations = {
+                op: self._load_module(filename)
+                for op, filename in self._MODULE_FILES.items()
+            }
+        return self._operations
+    
+    @property
+    def compiled_ops(self):
+        # Compile each module once, runs only reset the interpreter
+        if self._compiled_ops is None:
+            self._compiled_ops = {
+                op: self._compile_module(code)
+                for op, code in self.operations.items()
+                if code is not None
+            }
+        return self._compiled_ops
     
     def _load_module(self, filename):
         filepath = self.modules_dir / filename
         if not filepath.exists():
             return None
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            return ''.join(c for c in content if c in '><+-.,[]')
+        return _load_bf_module(str(filepath.resolve()))
+    
+    def _compile_module(self, code):
+        key = (code, self.interpreter.tape_size, self.interpreter.cell_size)
+        if key not in self._compiled_modules:
+            self._compiled_modules[key] = self.interpreter.compile(code)
+        return self._compiled_modules[key]
     
     # Big number (past 255) functions
     @staticmethod
     def _split_to_cells(number):
-        if number == 0:
-            return [0]
-        
         n = abs(number)
-        cells = []
-        
-        while n > 0:
-            cells.append(n & 0xFF)
-            n >>= 8
-        
-        return cells
+        return list(n.to_bytes((n.bit_length() + 7) // 8 or 1, 'little'))
     
     @staticmethod
     def _cells_to_number(cells):
-        if not cells:
-            return 0
-        
-        result = 0
-        for i, digit in enumerate(cells):
-            result += digit << (8 * i)
-        
-        return result
+        return int.from_bytes(bytes(cells), 'little')
     
     def _add_big_numbers(self, a_cells, b_cells):
         result = []
@@ -63,14 +98,8 @@ class Orchestrator:
             b_val = b_cells[i] if i < len(b_cells) else 0
             
             total = a_val + b_val + carry
-            
-            if total >= 256:
-                total -= 256
-                carry = 1
-            else:
-                carry = 0
-            
-            result.append(total)
+            carry = total >> 8
+            result.append(total & 0xFF)
         
         if carry:
             result.append(1)
@@ -95,15 +124,10 @@ class Orchestrator:
             a_val = a_cells[i] if i < len(a_cells) else 0
             b_val = b_cells[i] if i < len(b_cells) else 0
             
+            # A negative diff has all high bits set, so bit 8 is the borrow
             diff = a_val - b_val - borrow
-            
-            if diff < 0:
-                diff += 256
-                borrow = 1
-            else:
-                borrow = 0
-            
-            result.append(diff)
+            borrow = (diff >> 8) & 1
+            result.append(diff & 0xFF)
         
         while len(result) > 1 and result[-1] == 0:
             result.pop()
@@ -123,35 +147,7 @@ class Orchestrator:
         a_int = self._cells_to_number(a_cells)
         b_int = self._cells_to_number(b_cells)
         
-        if a_int.bit_length() + b_int.bit_length() <= 64:
-            result_int = a_int * b_int
-            return self._split_to_cells(result_int)
-        
-        result_size = len(a_cells) + len(b_cells)
-        result = [0] * result_size
-        
-        for i, a_digit in enumerate(a_cells):
-            if a_digit == 0:
-                continue
-                
-            carry = 0
-            for j, b_digit in enumerate(b_cells):
-                product = a_digit * b_digit + result[i + j] + carry
-                result[i + j] = product & 0xFF
-                carry = product >> 8
-            
-            if carry:
-                result[i + len(b_cells)] += carry
-        
-        for i in range(result_size - 1):
-            if result[i] >= 256:
-                result[i + 1] += result[i] >> 8
-                result[i] &= 0xFF
-        
-        while len(result) > 1 and result[-1] == 0:
-            result.pop()
-        
-        return result
+        return self._split_to_cells(a_int * b_int)
     
     def _divide_big_numbers(self, a_cells, b_cells):
         if not b_cells or b_cells == [0]:
@@ -185,19 +181,18 @@ class Orchestrator:
         a_int = self._cells_to_number(a_cells)
         b_int = self._cells_to_number(b_cells)
         
-        if b_int > 1000:
-            raise ValueError(f"Exponent is too large: {b_int}")
+        # Powers of two are a single shift with an exact bit length
+        if a_int & (a_int - 1) == 0:
+            shift = b_int * (a_int.bit_length() - 1)
+            if shift >= 1000000:
+                raise ValueError("Result will be too large")
+            return self._split_to_cells(1 << shift)
         
         estimated_bits = b_int * a_int.bit_length()
         if estimated_bits > 1000000:
-            raise ValueError(f"Result will be too large")
-        
-        try:
-            result_int = pow(a_int, b_int)
-        except (OverflowError, MemoryError):
-            raise ValueError(f"Overflow when calculating {a_int}^{b_int}")
+            raise ValueError("Result will be too large")
         
-        return self._split_to_cells(result_int)
+        return self._split_to_cells(pow(a_int, b_int))
 
     def _factorial_big_number(self, n_cells):
         n_int = self._cells_to_number(n_cells)
@@ -211,40 +206,39 @@ class Orchestrator:
         if n_int > 10000:
             raise ValueError(f"Factorial of {n_int} would be too large")
         
-        result_int = 1
-        for i in range(2, n_int + 1):
-            result_int *= i
-            
-            if result_int.bit_length() > 1000000:
-                raise ValueError(f"Factorial of {n_int} is too large")
+        # 10000! is about 118000 bits, well below the 1000000-bit limit
+        result_int = factorial(n_int)
         
         return self._split_to_cells(result_int)
     
     def _execute_big_operation(self, op, a, b):
-        a_cells = self._split_to_cells(a)
-        b_cells = self._split_to_cells(b)
+        # Cells only carry magnitudes, so operands are unsigned here too
+        a = abs(a)
+        b = abs(b)
         
         if op == '+':
-            result_cells = self._add_big_numbers(a_cells, b_cells)
+            return a + b
         elif op == '-':
-            result_cells = self._subtract_big_numbers(a_cells, b_cells)
+            return a - b if a >= b else 0
         elif op == '*':
-            result_cells = self._multiply_big_numbers(a_cells, b_cells)
+            return a * b
         elif op == '/':
-            result_cells = self._divide_big_numbers(a_cells, b_cells)
+            if b == 0:
+                raise ZeroDivisionError("Division by zero")
+            return a // b
         elif op == '^':
-            result_cells = self._power_big_numbers(a_cells, b_cells)
+            result_cells = self._power_big_numbers(self._split_to_cells(a), self._split_to_cells(b))
         elif op == '!':
             if b != 0:
                 raise ValueError("Factorial operation should have only one operand (n!)")
-            result_cells = self._factorial_big_number(a_cells)
+            result_cells = self._factorial_big_number(self._split_to_cells(a))
         else:
             raise ValueError(f"Unsupported operation: '{op}'")
         
         return self._cells_to_number(result_cells)
     
     def _prepare_input(self, a, b):
-        return bytes([a % 256, b % 256])
+        return _PACK_OPERANDS(a & 0xFF, b & 0xFF)
     
     def execute_operation(self, operation, a, b):
         if operation not in self.operations:
@@ -253,39 +247,29 @@ class Orchestrator:
         if operation == '/' and b == 0:
             return inf
         
-        bf_code = self.operations[operation]
-        if bf_code is None:
+        program = self.compiled_ops.get(operation)
+        if program is None:
             raise ValueError(f"Module for operation '{operation}' not found")
         
         input_data = self._prepare_input(a, b)
-        output = self.interpreter.execute(bf_code, input_data)
+        output = self.interpreter.run(program, input_data, jit=self.use_jit)
         
         return output[0] if output else 0
     
     def parse_expression(self, expression):
-        expression = expression.replace(' ', '')
-
-        if expression.endswith('!'):
-            try:
-                n = int(expression[:-1])
-                return '!', n, 0
-            except ValueError:
-                raise ValueError(f"Cannot parse factorial expression: '{expression}'")
+        expression = ''.join(expression.split())
         
-        operations = ['^', '*', '/', '+', '-']
+        match = _EXPRESSION_RE.fullmatch(expression)
+        if match is None:
+            if expression.endswith('!'):
+                raise ValueError(f"Cannot parse factorial expression: '{expression}'")
+            raise ValueError(f"Cannot parse expression: '{expression}'")
         
-        for op in operations:
-            if op in expression:
-                parts = expression.split(op, 1)
-                if len(parts) == 2:
-                    try:
-                        a = int(parts[0])
-                        b = int(parts[1])
-                        return op, a, b
-                    except ValueError:
-                        continue
+        a, op, b = match.groups()
+        if op is None:
+            return '!', int(a), 0
         
-        raise ValueError(f"Cannot parse expression: '{expression}'")
+        return op, int(a), int(b)
     
     def calculate(self, expression):
         op, a, b = self.parse_expression(expression)